@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+[1] Extract required/optional attributes from plan.json using schema.json.
+
+plan.json and schema.json must come from the same Terraform run:
+  terraform plan -out=tfplan && terraform show -json tfplan > plan.json
+  terraform providers schema -json > schema.json
+"""
+import sys
+
+try:
+  import orjson as _json_impl
+except ImportError:
+  try:
+    import ujson as _json_impl
+  except ImportError:
+    _json_impl = None
+import json
+
+
+class OriginValue:
+  """Data class for original values from plan.json and schema.json"""
+  def __init__(self, value=None, reference=None, required=False, description=""):
+    self.value = value
+    self.reference = reference
+    self.required = required
+    self.description = description
+
+  def __repr__(self):
+    return (f"OriginValue(value={self.value!r}, reference={self.reference!r}, "
+            f"required={self.required!r}, description={self.description!r})")
+
+
+def _load_json_file(path):
+  if _json_impl is not None:
+    with open(path, "rb") as f:
+      return _json_impl.loads(f.read())
+  with open(path) as f:
+    return json.load(f)
+
+
+# Top-level plan.json sections actually read by extract_data().  Large plans
+# also carry prior_state, resource_changes etc., which we never look at.
+_PLAN_SECTIONS = ("planned_values", "configuration")
+
+# Stream-parse only above this file size; for small plans a single
+# orjson/json pass is faster than incremental parsing.
+_STREAM_THRESHOLD = 64 * 1024 * 1024
+
+
+def load_plan(path):
+  """Load plan.json (terraform show -json tfplan).
+
+  Large plans are stream-parsed with ijson (when installed) so that only
+  the sections used by extract_data() are materialized.
+  """
+  import os
+  try:
+    import ijson
+  except ImportError:
+    ijson = None
+  if ijson is None or os.path.getsize(path) < _STREAM_THRESHOLD:
+    return _load_json_file(path)
+  plan = {}
+  with open(path, "rb") as f:
+    for key, value in ijson.kvitems(f, ""):
+      if key in _PLAN_SECTIONS:
+        plan[key] = value
+  return plan
+
+
+def load_schema(path):
+  """Load schema.json (terraform providers schema -json)."""
+  return _load_json_file(path)
+
+
+def _collect_planned_resources(module, module_name="root"):
+  """Collect resources from root_module and all nested child_modules."""
+  resources = []
+  stack = [(module_name, module)]
+  while stack:
+    name, current = stack.pop()
+    for resource in current.get("resources", ()):
+      resources.append((name, resource))
+    for child in reversed(current.get("child_modules", ())):
+      stack.append((child.get("address", name), child))
+  return resources
+
+
+def _collect_configuration_resources(module, address_prefix=""):
+  """Map full resource address -> configuration entry, across module_calls."""
+  configurations = {}
+  for resource in module.get("resources", []):
+    address = resource.get("address", "")
+    if address_prefix:
+      address = f"{address_prefix}.{address}"
+    configurations[address] = resource
+  for call_name, call in module.get("module_calls", {}).items():
+    child_prefix = f"module.{call_name}"
+    if address_prefix:
+      child_prefix = f"{address_prefix}.{child_prefix}"
+    configurations.update(_collect_configuration_resources(call.get("module", {}), child_prefix))
+  return configurations
+
+
+def _get_resource_schema(schema_json, resource_type):
+  """Find the block schema of a resource type across all provider schemas."""
+  for provider in schema_json.get("provider_schemas", {}).values():
+    resource_schema = provider.get("resource_schemas", {}).get(resource_type)
+    if resource_schema is not None:
+      return resource_schema.get("block", {})
+  return None
+
+
+def _is_computed_only(attr_schema):
+  return (attr_schema.get("computed", False)
+          and not attr_schema.get("required", False)
+          and not attr_schema.get("optional", False))
+
+
+def _get_reference(expression):
+  """Return the first non-attribute reference of an expression, if any."""
+  if not isinstance(expression, dict):
+    return None
+  references = expression.get("references")
+  if not references:
+    return None
+  return references[-1]
+
+
+def _wrap_leaves(value, attr_schema):
+  """Wrap the leaves of a nested value in OriginValue, keeping the structure."""
+  if isinstance(value, dict):
+    return {k: _wrap_leaves(v, attr_schema) for k, v in value.items()}
+  if isinstance(value, list):
+    return [_wrap_leaves(v, attr_schema) for v in value]
+  return OriginValue(
+    value=value,
+    reference=None,
+    required=attr_schema.get("required", False),
+    description=attr_schema.get("description", ""),
+  )
+
+
+def _build_values(values, expressions, block, address):
+  """Build the nested values dict with OriginValue instances at leaf nodes."""
+  attributes = block.get("attributes", {})
+  block_types = block.get("block_types", {})
+  result = {}
+  for attr_name, attr_schema in attributes.items():
+    if _is_computed_only(attr_schema):
+      continue
+    expression = expressions.get(attr_name) if isinstance(expressions, dict) else None
+    reference = _get_reference(expression)
+    if attr_name in values:
+      value = values[attr_name]
+      if isinstance(value, (dict, list)):
+        result[attr_name] = _wrap_leaves(value, attr_schema)
+      else:
+        result[attr_name] = OriginValue(
+          value=value,
+          reference=reference,
+          required=attr_schema.get("required", False),
+          description=attr_schema.get("description", ""),
+        )
+    elif reference is not None:
+      result[attr_name] = OriginValue(
+        value=None,
+        reference=reference,
+        required=attr_schema.get("required", False),
+        description=attr_schema.get("description", ""),
+      )
+    else:
+      print(f"WARNING: Attribute '{attr_name}' in resource '{address}' "
+            "defined in schema but missing in plan", file=sys.stderr)
+  for block_name, block_type in block_types.items():
+    if block_name not in values:
+      continue
+    child_block = block_type.get("block", {})
+    child_values = values[block_name]
+    if isinstance(child_values, list):
+      result[block_name] = [
+        _build_values(child, {}, child_block, address) for child in child_values
+      ]
+    elif isinstance(child_values, dict):
+      result[block_name] = _build_values(child_values, {}, child_block, address)
+  for attr_name in values:
+    if attr_name not in attributes and attr_name not in block_types:
+      print(f"WARNING: Attribute '{attr_name}' in resource '{address}' "
+            "found in plan but not in schema", file=sys.stderr)
+  return result
+
+
+def extract_data(plan_json, schema_json):
+  """
+  Extract non-computed attributes from plan.json using schema.json.
+
+  Returns:
+      list: [
+        {
+          "module": str,
+          "address": str,
+          "type": str,
+          "name": str,
+          "values": dict  # Nested structure with OriginValue instances at leaf nodes
+        },
+        ...
+      ]
+  """
+  root_module = plan_json.get("planned_values", {}).get("root_module", {})
+  configurations = _collect_configuration_resources(
+    plan_json.get("configuration", {}).get("root_module", {}))
+  extracted = []
+  schema_cache = {}
+  for module_name, resource in _collect_planned_resources(root_module):
+    address = resource.get("address", "")
+    resource_type = resource.get("type", "")
+    if resource_type in schema_cache:
+      block = schema_cache[resource_type]
+    else:
+      block = _get_resource_schema(schema_json, resource_type)
+      schema_cache[resource_type] = block
+    if block is None:
+      print(f"WARNING: Resource type '{resource_type}' not found in schema",
+            file=sys.stderr)
+      continue
+    configuration = configurations.get(address, {})
+    expressions = configuration.get("expressions", {})
+    extracted.append({
+      "module": module_name,
+      "address": address,
+      "type": resource_type,
+      "name": resource.get("name", ""),
+      "values": _build_values(resource.get("values", {}), expressions, block, address),
+    })
+  return extracted
+
+
+def test():
+  """Run extraction against a test case directory from the command line."""
+  import argparse
+  parser = argparse.ArgumentParser(description="Test data extraction")
+  parser.add_argument("plan_json", help="Path to plan.json")
+  parser.add_argument("schema_json", help="Path to schema.json")
+  parser.add_argument("--output", help="Output file path (optional)")
+  args = parser.parse_args()
+
+  plan_json = load_plan(args.plan_json)
+  schema_json = load_schema(args.schema_json)
+
+  result = extract_data(plan_json, schema_json)
+
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump(result, f, indent=2, default=vars, ensure_ascii=False)
+  else:
+    print(json.dumps(result, indent=2, default=vars, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+  test()
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+[2] Convert extracted data (OriginValue) into view-ready data (ViewValue).
+
+Resolves references, applies custom descriptions, decides the table type per
+resource type and applies resource specific processing (e.g. merging
+aws_iam_role_policy_attachment into the target IAM role).
+"""
+import hashlib
+import json
+import sys
+
+from data_extraction import OriginValue, _load_json_file
+
+# Resource types whose output has been verified against real plans.
+ALL_RESOURCES = [
+  "aws_iam_role",
+  "aws_iam_policy",
+  "aws_iam_role_policy_attachment",
+  "aws_s3_bucket",
+  "aws_s3_bucket_cors_configuration",
+]
+
+_ALL_RESOURCES_SET = frozenset(ALL_RESOURCES)
+
+# Rendered markdown bodies are cached on the registry (one build shares
+# schema, options and reference resolution, so the payload digest fully
+# determines the body there).  Tiny payloads are not worth the hash.
+_TABLE_CACHE_MIN_BYTES = 256
+
+# Sentinel for caches whose entries may legitimately be None.
+_MISSING = object()
+
+# Characters that must not appear raw inside a markdown table cell.
+_MD_ESCAPES = str.maketrans({"|": "\\|", "\n": "<br>"})
+
+# Markdown table header and row template, built once at import time.
+_TABLE_HEADER = ("| パラメータ | 値 | 必須 | デフォルト | 説明 |\n"
+                 "| --- | --- | --- | --- | --- |\n")
+_ROW_FMT = "| {} | {} | {} | {} | {} |\n".format
+
+def _schema_index(schema):
+  """Merge a schema block's attributes and block_types into one map.
+
+  Instances share the result through the registry's per-type caches
+  (every resource of a type gets the same schema block per build).
+  """
+  if schema is None:
+    return {}
+  index = dict(schema.get("attributes", {}))
+  index.update(schema.get("block_types", {}))
+  return index
+
+
+def _computed_only_roots(schema):
+  """Root attributes that are computed-only (never user-set).
+
+  Shared per resource type through the registry, like _schema_index.
+  """
+  if schema is None:
+    return frozenset()
+  return frozenset(
+    name for name, info in schema.get("attributes", {}).items()
+    if info.get("computed", False) and not info.get("required", False)
+    and not info.get("optional", False))
+
+
+class ViewValue:
+  """Data class for view-ready values with resolved references"""
+  def __init__(self, value, description=""):
+    self.value = value
+    self.description = description
+
+  def __repr__(self):
+    return f"ViewValue(value={self.value!r}, description={self.description!r})"
+
+
+def _join_path(path):
+  """Join a path tuple like ('cors_rule', '[0]', 'name') into a flattened key."""
+  parts = []
+  for component in path:
+    if component.startswith("[") or not parts:
+      parts.append(component)
+    else:
+      parts.append("." + component)
+  return "".join(parts)
+
+
+def _root_name(attr_name):
+  """Top-level attribute name of a flattened key (before any '.' or '[')."""
+  dot = attr_name.find(".")
+  bracket = attr_name.find("[")
+  if dot == -1:
+    if bracket == -1:
+      return attr_name
+    return attr_name[:bracket]
+  if bracket == -1 or dot < bracket:
+    return attr_name[:dot]
+  return attr_name[:bracket]
+
+
+def _normalize_leaves(node):
+  """Convert leaf dicts loaded from JSON back into OriginValue instances."""
+  if isinstance(node, OriginValue):
+    return node
+  if isinstance(node, dict):
+    if node and not (set(node) - {"value", "reference", "required", "description"}):
+      return OriginValue(**node)
+    return {k: _normalize_leaves(v) for k, v in node.items()}
+  if isinstance(node, list):
+    return [_normalize_leaves(v) for v in node]
+  return node
+
+
+class ResourceRegistry(list):
+  """List of resource instances with lookup indexes kept in step."""
+
+  def __init__(self):
+    super().__init__()
+    self.by_address = {}
+    self.by_role_name = {}
+    # Rendered table bodies, shared by near-identical resources of one
+    # build; dropped with the registry.
+    self.table_cache = {}
+    # Resolved descriptions per (class, resource type): within one build
+    # the schema and options-level overrides are fixed, so every
+    # instance of a type shares a warm cache.
+    self.description_caches = {}
+    # Pre-indexed schema lookups and computed-only root sets per
+    # resource type; dropped with the registry like the other
+    # per-build caches.
+    self.schema_indexes = {}
+    self.computed_only_roots = {}
+
+  def append(self, instance):
+    super().append(instance)
+    self.by_address[instance.address] = instance
+    if instance.resource_type == "aws_iam_role":
+      name = instance.values.get("name")
+      if isinstance(name, OriginValue) and name.value is not None:
+        self.by_role_name[name.value] = instance
+
+
+class Resource:
+  """Base class: holds one extracted resource and generates view data."""
+  table_type = "individual"
+  exclude_attributes = []
+  custom_descriptions = {}
+
+  def __init__(self, data, registry, schema=None, options=None):
+    self.module = data.get("module", "root")
+    self.address = data["address"]
+    self.resource_type = data["type"]
+    self.resource_name = data["name"]
+    self.values = _normalize_leaves(data["values"])
+    self.registry = registry
+    self.schema = schema
+    self.options = options if options is not None else {}
+    # The schema is immutable for the lifetime of an instance, so the
+    # per-attribute lookups below are safe to memoize.
+    self._attributes = self._shared_schema_cache(
+      registry, "schema_indexes", _schema_index)
+    self._computed_only_roots = self._shared_schema_cache(
+      registry, "computed_only_roots", _computed_only_roots)
+    self._attr_info_cache = {}
+    self._exclude_cache = {}
+    self._gen_data_cache = None
+    self._option_descriptions = self.options.get("custom_descriptions", {})
+    caches = getattr(registry, "description_caches", None)
+    if caches is None:
+      self._description_cache = {}
+    else:
+      self._description_cache = caches.setdefault(
+        (type(self), self.resource_type), {})
+    excluded = list(self.exclude_attributes) + self.options.get("exclude_keys", [])
+    self._excluded_roots = frozenset(
+      e for e in excluded if "." not in e and "[" not in e)
+    self._excluded_prefixes = [
+      e for e in excluded if "." in e or "[" in e]
+    # Schema-less plans with no configured excludes never exclude
+    # anything; let the hot path bail out without touching the cache.
+    self._has_excludes = bool(self._excluded_roots or self._excluded_prefixes
+                              or self._computed_only_roots)
+    registry.append(self)
+
+  def _shared_schema_cache(self, registry, attr, build):
+    """Schema-derived data shared per resource type via the registry."""
+    cache = getattr(registry, attr, None)
+    if cache is None:
+      return build(self.schema)
+    value = cache.get(self.resource_type)
+    if value is None:
+      value = build(self.schema)
+      cache[self.resource_type] = value
+    return value
+
+  def _get_attribute_info(self, attr_name):
+    """Look up the schema entry of a (possibly nested) attribute name."""
+    info = self._attr_info_cache.get(attr_name, _MISSING)
+    if info is not _MISSING:
+      return info
+    root = _root_name(attr_name)
+    info = self._attributes.get(root)
+    self._attr_info_cache[attr_name] = info
+    if root != attr_name:
+      self._attr_info_cache[root] = info
+    return info
+
+  def _should_exclude_attribute(self, attr_name):
+    if not self._has_excludes:
+      return False
+    if attr_name in self._exclude_cache:
+      return self._exclude_cache[attr_name]
+    root = _root_name(attr_name)
+    result = root in self._excluded_roots or root in self._computed_only_roots
+    if not result:
+      for excluded in self._excluded_prefixes:
+        if attr_name == excluded or attr_name.startswith(excluded + ".") \
+           or attr_name.startswith(excluded + "["):
+          result = True
+          break
+    self._exclude_cache[attr_name] = result
+    return result
+
+  def _get_description(self, attr_name):
+    if attr_name in self._description_cache:
+      return self._description_cache[attr_name]
+    root = _root_name(attr_name)
+    key = f"{self.resource_type}.{root}"
+    description = self.custom_descriptions.get(key) \
+                  or self._option_descriptions.get(key) or ""
+    if not description:
+      info = self._get_attribute_info(attr_name)
+      if info is not None:
+        description = info.get("description", "")
+    self._description_cache[attr_name] = description
+    return description
+
+  def _get_required_status(self, attr_name):
+    info = self._get_attribute_info(attr_name)
+    if info is not None:
+      return info.get("required", False)
+    return False
+
+  def _get_default_value(self, attr_name):
+    info = self._get_attribute_info(attr_name)
+    if info is not None:
+      return info.get("default", "")
+    return ""
+
+  def _row_metadata(self, root):
+    """Required/default/description table columns for one root attribute."""
+    info = self._get_attribute_info(root)
+    if info is None:
+      return "No", "-", self._get_description(root)
+    required = "Yes" if info.get("required", False) else "No"
+    default = self._format_value(info.get("default", "")) or "-"
+    return required, default, self._get_description(root)
+
+  def _resolve_reference(self, reference):
+    """Resolve a reference address to the name of the referenced resource."""
+    for instance in self.registry:
+      if instance.address == reference or reference.startswith(instance.address + "."):
+        name = instance.values.get("name")
+        if isinstance(name, OriginValue) and name.value is not None:
+          return name.value
+        return instance.resource_name
+    return reference.split(".")[-1]
+
+  def _display_value(self, origin):
+    """Return the display value of an OriginValue (references resolved)."""
+    if origin.value is None and origin.reference is not None:
+      return f"(ref) {self._resolve_reference(origin.reference)}"
+    return origin.value
+
+  def _format_value(self, value):
+    """Format a display value as a markdown table cell."""
+    if isinstance(value, str):
+      if "|" in value or "\n" in value:
+        return value.translate(_MD_ESCAPES)
+      return value
+    if value is None:
+      return "null"
+    if value is True:
+      return "true"
+    if value is False:
+      return "false"
+    return str(value)
+
+  def _flatten_values(self, values=None, path=()):
+    """Flatten nested values into (key, root, value) tuples (lazily).
+
+    The path is carried as a tuple and only joined to a string at the
+    leaf, so inner levels never allocate intermediate keys.  Leaves are
+    yielded as plain tuples rather than dicts: each one is consumed
+    exactly once, so a hash table per row would be wasted work.
+    """
+    if values is None:
+      values = self.values
+    stack = [(path, values)]
+    while stack:
+      current_path, node = stack.pop()
+      if isinstance(node, OriginValue):
+        yield _join_path(current_path), current_path[0], self._display_value(node)
+      elif isinstance(node, dict):
+        for key, child in reversed(node.items()):
+          if not current_path and self._should_exclude_attribute(key):
+            continue
+          stack.append((current_path + (key,), child))
+      elif isinstance(node, list):
+        for index in range(len(node) - 1, -1, -1):
+          stack.append((current_path + (f"[{index}]",), node[index]))
+      else:
+        yield _join_path(current_path), current_path[0], node
+
+  def _convert_values(self, values, attr_root=None):
+    """Convert nested OriginValue values into nested ViewValue values."""
+    converted = {}
+    for key, node in values.items():
+      root = key if attr_root is None else attr_root
+      if attr_root is None and self._should_exclude_attribute(key):
+        continue
+      converted[key] = self._convert_node(node, root)
+    return converted
+
+  def _convert_node(self, node, attr_root):
+    if isinstance(node, OriginValue):
+      description = self._get_description(attr_root) or node.description
+      return ViewValue(self._display_value(node), description)
+    if isinstance(node, dict):
+      return self._convert_values(node, attr_root)
+    if isinstance(node, list):
+      return [self._convert_node(item, attr_root) for item in node]
+    return ViewValue(node, self._get_description(attr_root))
+
+  def clear_cache(self):
+    """Drop derived data; call after mutating this instance's values."""
+    self._gen_data_cache = None
+
+  def _extra_values(self):
+    """Synthetic view values merged into gen_data() output (none by default)."""
+    return {}
+
+  def _extra_table_rows(self):
+    """Synthetic markdown rows appended after the real values (none by default)."""
+    return iter(())
+
+  def gen_data(self):
+    """Generate the view-ready dict for this resource (cached per instance)."""
+    if self._gen_data_cache is None:
+      values = self._convert_values(self.values)
+      values.update(self._extra_values())
+      self._gen_data_cache = {
+        "resource_type": self.resource_type,
+        "resource_name": self.resource_name,
+        "table_type": self.table_type,
+        "values": values,
+      }
+    return self._gen_data_cache
+
+  def _gen_table_rows(self):
+    """Yield the markdown rows of this resource's table."""
+    yield _TABLE_HEADER
+    # Flattening is depth-first, so leaves sharing a root attribute arrive
+    # consecutively; the three schema-derived columns only change per root.
+    should_exclude = self._should_exclude_attribute
+    format_value = self._format_value
+    prev_root = None
+    required = default = description = ""
+    for key, root, value in self._flatten_values():
+      if should_exclude(key):
+        continue
+      if root != prev_root:
+        required, default, description = self._row_metadata(root)
+        prev_root = root
+      yield _ROW_FMT(key, format_value(value), required, default, description)
+    yield from self._extra_table_rows()
+
+  def gen_table_iter(self):
+    """Yield the markdown table line by line, without building it whole."""
+    yield f"## {self.resource_type}.{self.resource_name}\n\n"
+    yield from self._gen_table_rows()
+
+  def gen_table(self):
+    """Generate a markdown table for this resource."""
+    return f"## {self.resource_type}.{self.resource_name}\n\n" + self._gen_table_body()
+
+  def _table_cache_payload(self):
+    """JSON payload that fully determines this table's rendered body."""
+    return json.dumps(self.values, default=vars, sort_keys=True, ensure_ascii=False)
+
+  def _gen_table_body(self):
+    cache = getattr(self.registry, "table_cache", None)
+    cache_key = None
+    if cache is not None:
+      payload = self._table_cache_payload()
+      if len(payload) >= _TABLE_CACHE_MIN_BYTES:
+        cache_key = (type(self).__name__, self.resource_type,
+                     hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest())
+        cached = cache.get(cache_key)
+        if cached is not None:
+          return cached
+    table = "".join(self._gen_table_rows())
+    if cache_key is not None:
+      cache[cache_key] = table
+    return table
+
+
+class AWS_IAM_ROLE(Resource):
+  table_type = "list"
+  custom_descriptions = {
+    "aws_iam_role.name": "IAMロール名",
+    "aws_iam_role.assume_role_policy": "信頼関係（AssumeRoleポリシー）",
+    "aws_iam_role.description": "ロールの説明",
+  }
+
+  def __init__(self, data, registry, schema=None, options=None):
+    super().__init__(data, registry, schema=schema, options=options)
+    self.attached_policies = []
+
+  def attach_policy(self, view_value):
+    self.attached_policies.append(view_value)
+    self.clear_cache()
+
+  def _extra_values(self):
+    if not self.attached_policies:
+      return {}
+    return {"attached_policies": list(self.attached_policies)}
+
+  def _extra_table_rows(self):
+    format_value = self._format_value
+    for index, policy in enumerate(self.attached_policies):
+      yield _ROW_FMT(f"attached_policies[{index}]", format_value(policy.value),
+                     "No", "-", policy.description)
+
+  def _table_cache_payload(self):
+    # Rows also depend on the attachments merged into this role.
+    payload = super()._table_cache_payload()
+    if self.attached_policies:
+      payload += json.dumps(self.attached_policies, default=vars,
+                            sort_keys=True, ensure_ascii=False)
+    return payload
+
+
+class AWS_IAM_POLICY(Resource):
+  table_type = "list"
+  custom_descriptions = {
+    "aws_iam_policy.name": "IAMポリシー名",
+    "aws_iam_policy.policy": "ポリシードキュメント",
+  }
+
+
+class AWS_S3_BUCKET(Resource):
+  table_type = "list"
+  custom_descriptions = {
+    "aws_s3_bucket.bucket": "S3バケット名",
+  }
+
+
+class AWS_IAM_ROLE_POLICY_ATTACHMENT(Resource):
+  """Merged into the target IAM role as 'attached_policies' (not output)."""
+  merged = False
+  custom_descriptions = {
+    "aws_iam_role_policy_attachment.role": "アタッチ先IAMロール",
+    "aws_iam_role_policy_attachment.policy_arn": "ポリシーARN",
+  }
+
+  def __init__(self, data, registry, schema=None, options=None):
+    super().__init__(data, registry, schema=schema, options=options)
+    role = self.values.get("role")
+    policy_arn = self.values.get("policy_arn")
+    if not isinstance(role, OriginValue) or not isinstance(policy_arn, OriginValue):
+      return
+    target = None
+    if role.reference is not None:
+      candidate = self.registry.by_address.get(role.reference)
+      if isinstance(candidate, AWS_IAM_ROLE):
+        target = candidate
+    if target is None and role.value is not None:
+      target = self.registry.by_role_name.get(role.value)
+    if target is not None:
+      target.attach_policy(
+        ViewValue(self._display_value(policy_arn), "アタッチされたポリシー"))
+      self.merged = True
+    if not self.merged:
+      print(f"WARNING: Role for '{self.address}' not found; kept as its own table",
+            file=sys.stderr)
+
+
+RESOURCE_CLASSES = {
+  "aws_iam_role": AWS_IAM_ROLE,
+  "aws_iam_policy": AWS_IAM_POLICY,
+  "aws_s3_bucket": AWS_S3_BUCKET,
+  "aws_iam_role_policy_attachment": AWS_IAM_ROLE_POLICY_ATTACHMENT,
+}
+
+# Types merged into other resources; instantiated last so the merge
+# target already exists in the registry.
+MERGE_RESOURCES = ["aws_iam_role_policy_attachment"]
+
+
+def build_resources(extracted_data, options=None, schema_json=None):
+  """Instantiate a Resource (subclass) per extracted resource."""
+  from data_extraction import _get_resource_schema
+  options = options if options is not None else {}
+  registry = ResourceRegistry()
+  schema_cache = {}
+  ordered = [r for r in extracted_data if r["type"] not in MERGE_RESOURCES] \
+          + [r for r in extracted_data if r["type"] in MERGE_RESOURCES]
+  for data in ordered:
+    resource_type = sys.intern(data["type"])
+    if resource_type not in _ALL_RESOURCES_SET:
+      if options.get("strict_mode", False):
+        raise ValueError(f"ERROR: Resource type '{data['address']}' is not verified "
+                         "(strict mode)")
+      print(f"WARNING: Resource type '{data['address']}' is not verified",
+            file=sys.stderr)
+    cls = RESOURCE_CLASSES.get(resource_type, Resource)
+    if resource_type not in schema_cache:
+      schema_cache[resource_type] = \
+        _get_resource_schema(schema_json, resource_type) if schema_json else None
+    cls(data, registry, schema=schema_cache[resource_type], options=options)
+  return registry
+
+
+def format_data(extracted_data, options=None, schema_json=None):
+  """
+  Convert OriginValue to ViewValue with reference resolution and special processing.
+
+  Args:
+      extracted_data: Output from extract_data() (list with OriginValue)
+      options: Optional settings
+          - exclude_keys: List[str] - Keys to exclude from output
+          - custom_descriptions: dict - Custom descriptions to override
+            Format: {"resource_type.attribute": "description", ...}
+          - strict_mode: bool - Fail on unverified resource types (default: False)
+      schema_json: Optional schema.json dict for required/default columns
+
+  Returns:
+      list: [
+        {
+          "resource_type": str,
+          "resource_name": str,
+          "table_type": str,  # "individual" or "list"
+          "values": dict  # ViewValue instances at leaf nodes
+        },
+        ...
+      ]
+  """
+  registry = build_resources(extracted_data, options=options, schema_json=schema_json)
+  return [r.gen_data() for r in registry if not getattr(r, "merged", False)]
+
+
+def test():
+  """Run formatting against a test case directory from the command line."""
+  import argparse
+  parser = argparse.ArgumentParser(description="Test data formatting")
+  parser.add_argument("extracted_data", help="Path to extracted_data.json")
+  parser.add_argument("--options", help="Path to options JSON (optional)")
+  parser.add_argument("--schema", help="Path to schema.json (optional)")
+  parser.add_argument("--output", help="Output file path (optional)")
+  args = parser.parse_args()
+
+  extracted_data = _load_json_file(args.extracted_data)
+  options = _load_json_file(args.options) if args.options else None
+  schema_json = _load_json_file(args.schema) if args.schema else None
+
+  result = format_data(extracted_data, options=options, schema_json=schema_json)
+
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump(result, f, indent=2, default=vars, ensure_ascii=False)
+  else:
+    print(json.dumps(result, indent=2, default=vars, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+  test()
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+[3] Generate HTML tables from formatted data.
+
+Individual tables show one resource in detail (nested structures are
+expressed with rowspan).  List tables show one resource per row with
+fixed column widths and collapsible long content.
+"""
+import json
+import re
+import sys
+from functools import lru_cache
+from operator import itemgetter
+
+STYLE = """<style>
+    body {
+        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif;
+        margin: 20px;
+        background-color: #f6f8fa;
+    }
+    h1 {
+        color: #24292e;
+        border-bottom: 3px solid #0366d6;
+        padding-bottom: 10px;
+    }
+    h2 {
+        color: #24292e;
+        background-color: #e1e4e8;
+        padding: 8px 12px;
+        border-left: 4px solid #0366d6;
+        margin-top: 30px;
+    }
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        margin-bottom: 30px;
+        background-color: white;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.12);
+    }
+    thead {
+        background-color: #0366d6;
+        color: white;
+    }
+    th, td {
+        border: 1px solid #d1d5da;
+        padding: 8px 12px;
+        text-align: left;
+        vertical-align: top;
+    }
+    th {
+        font-weight: 600;
+    }
+    tbody tr:hover {
+        background-color: #f6f8fa;
+    }
+    .index-cell {
+        background-color: #f1f8ff;
+        font-weight: 600;
+        text-align: center;
+        color: #0366d6;
+        min-width: 50px;
+    }
+    .param-name {
+        font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
+        font-size: 0.9em;
+        color: #032f62;
+    }
+    .param-value {
+        font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
+        font-size: 0.9em;
+        word-break: break-all;
+    }
+    .resource-name {
+        font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
+        font-size: 0.9em;
+        color: #032f62;
+        font-weight: 600;
+    }
+    details {
+        margin: 0;
+    }
+    summary {
+        cursor: pointer;
+        color: #0366d6;
+        font-weight: 600;
+        padding: 4px 8px;
+        border-radius: 3px;
+        display: inline-block;
+    }
+    summary:hover {
+        background-color: #f1f8ff;
+    }
+    summary::marker {
+        color: #0366d6;
+    }
+    .expandable-content {
+        background-color: #f6f8fa;
+        border: 1px solid #d1d5da;
+        border-radius: 3px;
+        padding: 8px;
+        margin-top: 8px;
+        font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
+        font-size: 0.85em;
+        white-space: pre-wrap;
+        word-break: break-all;
+        max-height: 300px;
+        overflow-y: auto;
+    }
+    .item-list {
+        list-style: none;
+        padding: 0;
+        margin: 0;
+    }
+    .item-list-entry {
+        padding: 4px 0;
+        border-bottom: 1px solid #e1e4e8;
+    }
+    .item-list-entry:last-child {
+        border-bottom: none;
+    }
+    .item-value {
+        font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
+        font-size: 0.85em;
+        color: #586069;
+    }
+    .ref {
+        color: #e36209;
+        font-style: italic;
+    }
+</style>
+"""
+
+# Threshold above which a list-table cell is rendered collapsible.
+EXPANDABLE_LENGTH = 80
+
+# Translation table equivalent to html.escape(quote=True), applied in a
+# single pass instead of five chained str.replace calls.
+_HTML_ESCAPE = str.maketrans({
+  "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+# Cell class strings precomputed for both reference states; building
+# them with += in the row loops allocated a fresh string per ref cell.
+_VALUE_CLASS = "param-value"
+_VALUE_CLASS_REF = "param-value ref"
+_ENTRY_CLASS = "item-list-entry"
+_ENTRY_CLASS_REF = "item-list-entry ref"
+
+# Sort key shared by both table kinds; C-level itemgetter avoids a
+# Python lambda call per comparison element.
+_BY_NAME = itemgetter("resource_name")
+
+# One flattened-key segment: attribute name plus optional [index].
+# The name class is negated so characters like ':' or '/' (common in
+# tag keys) pass through instead of splitting or vanishing.
+_SEGMENT_RE = re.compile(r"([^.\[\]]+)(?:\[(\d+)\])?")
+
+# Precompiled cell templates; %-formatting on a constant string is the
+# cheapest formatting path in CPython.
+_PARAM_TD = '    <td class="param-name" rowspan="%d">%s</td>\n'
+_PARAM_COLSPAN_TD = '    <td class="param-name" rowspan="1" colspan="%d">%s</td>\n'
+_INDEX_TD = '    <td class="index-cell" rowspan="%d">%s</td>\n'
+_PAD_TD = '    <td rowspan="1">-</td>\n'
+_VALUE_TD = '    <td class="%s">%s</td>\n'
+_DESCRIPTION_TD = "    <td>%s</td>\n"
+
+# Header cells and the details summary hold fixed labels with no
+# HTML-special characters, so they are emitted verbatim.
+_INDIVIDUAL_THEAD = ('    <th colspan="%d">パラメータ</th>\n'
+                     "    <th>値</th>\n"
+                     "    <th>説明</th>\n")
+_LIST_NAME_TH = "    <th>リソース名</th>\n"
+_DETAILS_SUMMARY = "        <summary>詳細を表示</summary>\n"
+
+# Constant page shell, concatenated once at import time.
+_PAGE_HEADER = (
+  "<!DOCTYPE html>\n"
+  '<html lang="ja">\n'
+  "<head>\n"
+  '    <meta charset="UTF-8">\n'
+  '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+  "    <title>Terraform2Sheet</title>\n"
+  "</head>\n"
+  + STYLE +
+  "<body>\n"
+  "<h1>Terraform2Sheet</h1>\n"
+)
+_PAGE_FOOTER = "</body>\n</html>\n"
+
+
+@lru_cache(maxsize=16)
+def _render_thead(max_depth):
+  """<thead> of an individual table; it varies only with max_depth."""
+  return "<thead>\n  <tr>\n" + _INDIVIDUAL_THEAD % max_depth + "  </tr>\n</thead>\n"
+
+
+@lru_cache(maxsize=4096)
+def _parse_key(key):
+  """Parse a flattened key into ((name, index), ...) segments."""
+  return tuple(
+    (sys.intern(match.group(1)),
+     int(match.group(2)) if match.group(2) is not None else None)
+    for match in _SEGMENT_RE.finditer(key))
+
+
+def _display_str(value):
+  """Canonical string form of a cell value (JSON-style scalars)."""
+  if isinstance(value, str):
+    return value
+  if value is None:
+    return "null"
+  if value is True:
+    return "true"
+  if value is False:
+    return "false"
+  return str(value)
+
+
+def _leaf(node):
+  """Return (value, description) if node is a ViewValue leaf, else None."""
+  if isinstance(node, dict):
+    if "value" in node and not (set(node) - {"value", "description"}):
+      return node["value"], node.get("description", "")
+    return None
+  if hasattr(node, "value") and hasattr(node, "description"):
+    return node.value, node.description
+  return None
+
+
+def _plain(node):
+  """Strip ViewValue wrappers from a nested structure (for JSON dumps)."""
+  leaf = _leaf(node)
+  if leaf is not None:
+    return leaf[0]
+  if isinstance(node, dict):
+    return {k: _plain(v) for k, v in node.items()}
+  if isinstance(node, list):
+    return [_plain(v) for v in node]
+  return node
+
+
+class HtmlView:
+  """Render formatted data as a full HTML page."""
+
+  def __init__(self, formatted_data):
+    self.resources = formatted_data
+
+  def generate_this_table(self, resource):
+    """Whether a table should be generated for this resource."""
+    return bool(resource.get("values"))
+
+  def _escape_html(self, text):
+    if isinstance(text, (int, float, bool)):
+      return str(text)
+    text = str(text)
+    if "&" not in text and "<" not in text and ">" not in text \
+       and '"' not in text and "'" not in text:
+      return text
+    return text.translate(_HTML_ESCAPE)
+
+  def _is_ref(self, value):
+    return isinstance(value, str) and value.startswith("(ref) ")
+
+  def render(self):
+    """Render the whole page."""
+    parts = [_PAGE_HEADER]
+    groups = {}
+    for resource in self.resources:
+      if not self.generate_this_table(resource):
+        continue
+      groups.setdefault(resource["resource_type"], []).append(resource)
+    for resource_type, group in groups.items():
+      table_type = group[0].get("table_type", "individual")
+      if table_type == "list":
+        self._render_list_table(resource_type, group, parts)
+      else:
+        for resource in sorted(group, key=_BY_NAME):
+          self._render_resource(resource, parts)
+    parts.append(_PAGE_FOOTER)
+    return "".join(parts)
+
+  def _flatten_attributes(self, values, prefix=""):
+    """Flatten nested ViewValue values into (key, value, description) rows.
+
+    Rows are plain tuples: each one is consumed once by the structuring
+    pass, so a dict per leaf would only add allocation overhead.
+    """
+    stack = [(prefix, values)]
+    while stack:
+      current_prefix, node = stack.pop()
+      leaf = _leaf(node)
+      if leaf is not None:
+        yield current_prefix, _display_str(leaf[0]), leaf[1]
+      elif isinstance(node, dict):
+        for key, child in reversed(node.items()):
+          full_key = f"{current_prefix}.{key}" if current_prefix else key
+          stack.append((full_key, child))
+      elif isinstance(node, list):
+        for index in range(len(node) - 1, -1, -1):
+          stack.append((f"{current_prefix}[{index}]", node[index]))
+      else:
+        yield current_prefix, _display_str(node), ""
+
+  def _structure_attributes(self, rows):
+    """Parse flattened rows into (segments, value, description) tuples.
+
+    Returns (items, max_depth); the number of parameter columns (index
+    levels count as one each) is tracked while parsing so the items
+    never need a second traversal.
+    """
+    items = []
+    max_depth = 1
+    for key, value, description in rows:
+      segments = _parse_key(key)
+      depth = 0
+      for name, index in segments:
+        depth += 1
+        if index is not None:
+          depth += 1
+      if depth > max_depth:
+        max_depth = depth
+      items.append((segments, value, description))
+    return items, max_depth
+
+  def _row_cells(self, segments):
+    """Expand segments into (kind, text) cells for one row."""
+    cells = []
+    for name, index in segments:
+      cells.append(("name", name))
+      if index is not None:
+        cells.append(("index", str(index + 1)))
+    return cells
+
+  def _render_structured_attributes(self, items, max_depth, parts):
+    """Append table body rows (rowspan for shared prefixes) to parts."""
+    if max_depth <= 1:
+      # All attributes are flat: every row is its own single-column cell,
+      # so the rowspan bookkeeping below would be pure overhead.
+      for segments, value, description in items:
+        value_class = _VALUE_CLASS_REF if self._is_ref(value) else _VALUE_CLASS
+        parts.append("  <tr>\n")
+        parts.append(_PARAM_COLSPAN_TD % (1, self._escape_html(segments[0][0])))
+        self._generate_table_row(value, description, value_class, parts)
+        parts.append("  </tr>\n")
+      return
+    # Flattening is depth-first, so rows sharing a cell prefix are
+    # always contiguous: a cell spans exactly the run of following rows
+    # whose shared prefix reaches past its depth.  shared[i] is the
+    # length of the cell prefix row i has in common with row i-1, so no
+    # per-cell path tuples need to be built at all.
+    cell_rows = [self._row_cells(segments) for segments, _, _ in items]
+    total = len(items)
+    shared = [0] * total
+    for position in range(1, total):
+      prev_cells = cell_rows[position - 1]
+      cells = cell_rows[position]
+      limit = min(len(prev_cells), len(cells))
+      common = 0
+      while common < limit and prev_cells[common] == cells[common]:
+        common += 1
+      shared[position] = common
+    for position, (segments, value, description) in enumerate(items):
+      parts.append("  <tr>\n")
+      cells = cell_rows[position]
+      if len(cells) == 1:
+        kind, text = cells[0]
+        parts.append(_PARAM_COLSPAN_TD % (max_depth, self._escape_html(text)))
+      else:
+        for depth in range(shared[position], len(cells)):
+          kind, text = cells[depth]
+          rowspan = 1
+          follower = position + 1
+          while follower < total and shared[follower] > depth:
+            rowspan += 1
+            follower += 1
+          if kind == "index":
+            parts.append(_INDEX_TD % (rowspan, self._escape_html(text)))
+          else:
+            parts.append(_PARAM_TD % (rowspan, self._escape_html(text)))
+        used = len(cells)
+        for _ in range(max_depth - used):
+          parts.append(_PAD_TD)
+      value_class = _VALUE_CLASS_REF if self._is_ref(value) else _VALUE_CLASS
+      self._generate_table_row(value, description, value_class, parts)
+      parts.append("  </tr>\n")
+
+  def _generate_table_row(self, value, description, value_class, parts):
+    """Append the value and description cells of one row to parts.
+
+    Values arrive from _flatten_attributes already stringified, so the
+    hot row loop never casts.
+    """
+    parts.append(_VALUE_TD % (value_class, self._escape_html(value)))
+    parts.append(_DESCRIPTION_TD % self._escape_html(description))
+
+  def _render_resource(self, resource, parts):
+    """Append one resource's individual table to parts."""
+    parts.append(f"<h2>{self._escape_html(resource['resource_type'])}."
+                 f"{self._escape_html(resource['resource_name'])}</h2>\n")
+    rows = self._flatten_attributes(resource["values"])
+    items, max_depth = self._structure_attributes(rows)
+    parts.append("<table>\n")
+    parts.append(_render_thead(max_depth))
+    parts.append("<tbody>\n")
+    self._render_structured_attributes(items, max_depth, parts)
+    parts.append("</tbody>\n")
+    parts.append("</table>\n")
+
+  def _list_columns(self, resources):
+    """Union of top-level attribute keys, in order of first appearance."""
+    columns = []
+    for resource in resources:
+      for key in resource["values"]:
+        if key not in columns:
+          columns.append(key)
+    return columns
+
+  def _column_descriptions(self, resources, columns):
+    """First non-empty description per column, used as the header label."""
+    descriptions = {}
+    for column in columns:
+      for resource in resources:
+        node = resource["values"].get(column)
+        leaf = _leaf(node)
+        if leaf is not None and leaf[1]:
+          descriptions[column] = leaf[1]
+          break
+        if isinstance(node, list) and node:
+          item_leaf = _leaf(node[0])
+          if item_leaf is not None and item_leaf[1]:
+            descriptions[column] = item_leaf[1]
+            break
+      if column not in descriptions:
+        descriptions[column] = column
+    return descriptions
+
+  def _render_list_cell(self, node, parts):
+    """Append one cell of a list table to parts."""
+    leaf = _leaf(node)
+    if leaf is not None:
+      value = _display_str(leaf[0])
+      if len(value) > EXPANDABLE_LENGTH or "\n" in value:
+        parts.append("    <td>\n")
+        parts.append("      <details>\n")
+        parts.append(_DETAILS_SUMMARY)
+        parts.append(f'        <div class="expandable-content">'
+                     f"{self._escape_html(value)}</div>\n")
+        parts.append("      </details>\n")
+        parts.append("    </td>\n")
+        return
+      value_class = _VALUE_CLASS_REF if self._is_ref(value) else _VALUE_CLASS
+      parts.append(f'    <td class="{value_class}">{self._escape_html(value)}</td>\n')
+      return
+    if isinstance(node, list) and all(_leaf(item) is not None for item in node):
+      parts.append("    <td>\n")
+      parts.append('      <ul class="item-list">\n')
+      for item in node:
+        value = str(_leaf(item)[0])
+        entry_class = _ENTRY_CLASS_REF if self._is_ref(value) else _ENTRY_CLASS
+        parts.append(f'        <li class="{entry_class}">\n')
+        parts.append(f'          <div class="item-value">{self._escape_html(value)}</div>\n')
+        parts.append("        </li>\n")
+      parts.append("      </ul>\n")
+      parts.append("    </td>\n")
+      return
+    if node is None:
+      parts.append("    <td></td>\n")
+      return
+    dumped = json.dumps(_plain(node), indent=2, ensure_ascii=False)
+    parts.append("    <td>\n")
+    parts.append("      <details>\n")
+    parts.append(_DETAILS_SUMMARY)
+    parts.append(f'        <div class="expandable-content">'
+                 f"{self._escape_html(dumped)}</div>\n")
+    parts.append("      </details>\n")
+    parts.append("    </td>\n")
+
+  def _render_list_table(self, resource_type, resources, parts):
+    """Append the list table of one resource type to parts."""
+    parts.append(f"<h2>{self._escape_html(resource_type)} 一覧</h2>\n")
+    columns = self._list_columns(resources)
+    descriptions = self._column_descriptions(resources, columns)
+    parts.append("<table>\n")
+    parts.append("<thead>\n")
+    parts.append("  <tr>\n")
+    parts.append(_LIST_NAME_TH)
+    for column in columns:
+      parts.append(f"    <th>{self._escape_html(descriptions[column])}</th>\n")
+    parts.append("  </tr>\n")
+    parts.append("</thead>\n")
+    parts.append("<tbody>\n")
+    for resource in sorted(resources, key=_BY_NAME):
+      parts.append("  <tr>\n")
+      parts.append(f'    <td class="resource-name">'
+                   f"{self._escape_html(resource['resource_name'])}</td>\n")
+      for column in columns:
+        self._render_list_cell(resource["values"].get(column), parts)
+      parts.append("  </tr>\n")
+    parts.append("</tbody>\n")
+    parts.append("</table>\n")
+
+
+def generate_html(formatted_data):
+  """
+  Generate HTML table from formatted data.
+
+  Args:
+      formatted_data: Output from format_data() (list of resources)
+
+  Returns:
+      str: HTML string
+  """
+  return HtmlView(formatted_data).render()
+
+
+def test():
+  """Run HTML generation against a test case directory from the command line."""
+  import argparse
+  parser = argparse.ArgumentParser(description="Test HTML view generation")
+  parser.add_argument("formatted_data", help="Path to formatted_data.json")
+  parser.add_argument("--output", help="Output file path (optional)")
+  args = parser.parse_args()
+
+  from data_extraction import _load_json_file
+  formatted_data = _load_json_file(args.formatted_data)
+
+  result = generate_html(formatted_data)
+
+  if args.output:
+    with open(args.output, "wb") as f:
+      f.write(result.encode("utf-8"))
+  else:
+    print(result)
+
+
+if __name__ == "__main__":
+  test()
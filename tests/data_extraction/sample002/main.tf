@@ -0,0 +1,19 @@
+resource "aws_s3_bucket" "main" {
+  bucket = "terraform2sheet-sample-bucket"
+}
+
+resource "aws_s3_bucket_cors_configuration" "main" {
+  bucket = aws_s3_bucket.main.id
+
+  cors_rule {
+    allowed_headers = ["*"]
+    allowed_methods = ["GET", "POST", "PUT"]
+    allowed_origins = ["https://example.com"]
+    max_age_seconds = 3000
+  }
+
+  cors_rule {
+    allowed_methods = ["DELETE"]
+    allowed_origins = ["https://admin.example.com"]
+  }
+}